@@ -38,6 +38,9 @@ setup(
         "Topic :: Utilities",
     ],
     python_requires=">=3.6",
+    extras_require={
+        'fast': ['orjson'],
+    },
     entry_points={
         'console_scripts': [
             'lolTasks=task:entry_point',
@@ -1,17 +1,29 @@
 #!/usr/bin/env python3
+import bisect
+import collections
 import curses
 import datetime
+import functools
 import json
 import os
+import stat
 import sys
+import time
+import unicodedata
 from datetime import timedelta
+from types import MappingProxyType
+
+try:
+    import orjson  # Optional C JSON codec, much faster than the stdlib one
+except ImportError:
+    orjson = None
 
 DATA_DIR = os.path.expanduser('~/.lolTasks')
 DATA_FILE = os.path.join(DATA_DIR, 'weekly_tasks.json')
 
 STATES = ['TO-DO', 'PENDING', 'COMPLETED']
-STATE_CYCLE_FORWARD = {s: STATES[(i + 1) % 3] for i, s in enumerate(STATES)}
-STATE_CYCLE_BACKWARD = {s: STATES[(i - 1) % 3] for i, s in enumerate(STATES)}
+# In memory a task's state is its index into STATES
+STATE_CODES = {s: i for i, s in enumerate(STATES)}
 
 # Display symbols (fixed visual width = 4 chars including spaces/brackets)
 STATE_SYMBOLS = {
@@ -20,190 +32,564 @@ STATE_SYMBOLS = {
     'COMPLETED': '[x] ',
 }
 
+STATE_SYMBOLS_BY_CODE = tuple(STATE_SYMBOLS[s] for s in STATES)
+
 # For consistent offset calculation during editing (always 4 chars)
 PREFIX_WIDTH = 4
 
 COLORS = {'TO-DO': 1, 'PENDING': 2, 'COMPLETED': 3}
 
+# Stand-in for weeks that have no entry in the data yet (read-only)
+_EMPTY_WEEK = MappingProxyType({'title': 'Week title', 'texts': (), 'states': ()})
+
+# Draw attributes keyed by (is_active, is_selected), each a tuple indexed by state code;
+# built in main() once colors exist
+STATE_ATTR = {}
+
+# Parsed contents of DATA_FILE, reused by load_data() until the file's mtime changes
+_CACHE = {'mtime_ns': 0, 'data': None}
+
+# Edits only mark the data dirty; flush_data() coalesces them into one save per SAVE_DEBOUNCE seconds
+SAVE_DEBOUNCE = 0.25
+
+# During a burst of queued keys (paste, autorepeat) repaint at most this often
+FRAME_INTERVAL = 1 / 60
+_dirty = False
+_last_flush = time.monotonic()
+
+# Screen regions, each drawn into its own curses window (top to bottom)
+REGIONS = ('prev', 'active', 'next', 'help')
+WINDOWS = {}
+
+# Help bar text keyed by (reorder_mode, a task is selected); only these four variants exist
+_HELP_TEMPLATE = "↑↓/kj:Move/Reorder{mode} | r:Reorder | ←→:Week | Tab/S-Tab:State | I:Edit@start | a:Add{hint} | ⏎:Edit | d:Del | n/p:Shift | Ctrl+U:Undo | Ctrl+R:Redo | q:Quit"
+HELP_VARIANTS = {
+    (reorder, on_task): _HELP_TEMPLATE.format(
+        mode=" [REORDER]" if reorder else "",
+        hint=" (after selected)" if on_task else " (at end)")
+    for reorder in (False, True) for on_task in (False, True)
+}
+
+@functools.lru_cache(maxsize=512)
 def get_week_key(date):
     y, w, _ = date.isocalendar()
     return f"{y}-W{w:02d}"
 
+@functools.lru_cache(maxsize=512)
 def week_to_date(year, week):
     d = datetime.date(year, 1, 4)
     d -= timedelta(days=d.isocalendar()[2] - 1)
     return d + timedelta(weeks=week - 1)
 
+@functools.lru_cache(maxsize=512)
+def week_neighbors(week_key):
+    """Return (prev_week_key, next_week_key) for a 'YYYY-Www' key"""
+    y, w = week_key.split('-W')
+    date = week_to_date(int(y), int(w))
+    return get_week_key(date - timedelta(weeks=1)), get_week_key(date + timedelta(weeks=1))
+
+def new_week():
+    return {'title': _EMPTY_WEEK['title'], 'texts': [], 'states': bytearray()}
+
+def is_empty_week(week):
+    return not week['texts'] and week['title'] == _EMPTY_WEEK['title']
+
+def copy_week(week):
+    return {'title': week['title'], 'texts': list(week['texts']), 'states': bytearray(week['states'])}
+
+# Weeks are stored on disk as {'title', 'tasks': [{'text', 'state'}, ...]} but held in
+# memory as parallel 'texts' and 'states' columns, which is cheaper to draw and mutate.
+# States are one byte each: a bytearray of indexes into STATES.
+def week_from_json(week):
+    tasks = week['tasks']
+    return {
+        'title': week['title'],
+        'texts': [t['text'] for t in tasks],
+        'states': bytearray(STATE_CODES[t['state']] for t in tasks),
+    }
+
+def week_to_json(week):
+    tasks = [{'text': text, 'state': STATES[code]} for text, code in zip(week['texts'], week['states'])]
+    return {'title': week['title'], 'tasks': tasks}
+
 def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    try:
+        st = os.stat(DATA_FILE)
+    except FileNotFoundError:
+        # Nothing saved yet; hand back the same dict so unsaved edits aren't lost
+        if _CACHE['data'] is None:
+            _CACHE['data'] = {}
+        return _CACHE['data']
+    # Only re-read and re-parse the file when something else has written it
+    if _CACHE['data'] is not None and st.st_mtime_ns == _CACHE['mtime_ns']:
+        return _CACHE['data']
+    with open(DATA_FILE, 'rb') as f:
+        raw = f.read()
+    stored = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    data = {k: week_from_json(w) for k, w in stored.items()}
+    _CACHE['data'] = data
+    _CACHE['mtime_ns'] = st.st_mtime_ns
+    return data
 
 def save_data(data):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    # Weeks that were only viewed, never edited, aren't worth storing
+    stored = {k: week_to_json(w) for k, w in data.items() if not is_empty_week(w)}
+    # Write to a temp file and rename so the file (and its mtime) changes atomically.
+    # Replace the symlink's target rather than the link itself, and keep the file's mode.
+    target = os.path.realpath(DATA_FILE)
+    tmp = target + '.tmp'
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = None
+    if orjson is not None:
+        payload = orjson.dumps(stored)
+    else:
+        payload = json.dumps(stored, separators=(',', ':')).encode('utf-8')
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    create_mode = 0o666 if mode is None else mode
+    try:
+        fd = os.open(tmp, flags, create_mode)
+    except FileNotFoundError:
+        # Only the first save (or one after the directory was removed) needs to create it
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd = os.open(tmp, flags, create_mode)
+    # The payload is already one bytes buffer, so write it straight to the descriptor
+    try:
+        if mode is not None and hasattr(os, 'fchmod'):
+            os.fchmod(fd, mode)  # The umask may have narrowed it, or a stale temp file had another
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, target)
+    _CACHE['data'] = data
+    _CACHE['mtime_ns'] = os.stat(DATA_FILE).st_mtime_ns
+
+def mark_dirty():
+    global _dirty
+    _dirty = True
 
-def get_input(stdscr, base_y, base_x, initial='', start_at_beginning=False):
+def flush_data(data, force=False):
+    """Write pending changes, at most once every SAVE_DEBOUNCE seconds unless forced"""
+    global _dirty, _last_flush
+    now = time.monotonic()
+    if _dirty and (force or now - _last_flush > SAVE_DEBOUNCE):
+        save_data(data)
+        _dirty = False
+        _last_flush = now
+
+def sync_data():
+    """Make the last save durable; only worth the cost once, when quitting"""
+    if not os.path.exists(DATA_FILE):
+        return
+    target = os.path.realpath(DATA_FILE)
+    dir_flags = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+    for path, flags in ((target, os.O_RDONLY), (os.path.dirname(target), dir_flags)):
+        try:
+            fd = os.open(path, flags)
+        except OSError:
+            continue  # Directories can't be opened on every platform
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def export_data():
+    """Print the task data as pretty-printed JSON"""
+    stored = {k: week_to_json(w) for k, w in load_data().items()}
+    print(json.dumps(stored, indent=4))
+
+@functools.lru_cache(maxsize=4096)
+def _task_row(state, text, wrap_width):
+    """Display text for an unwrapped task row: state symbol plus text, truncated to fit"""
+    full = STATE_SYMBOLS_BY_CODE[state] + text
+    if len(full) > wrap_width + 5:
+        full = full[:wrap_width - 3] + "..."
+    return full
+
+@functools.lru_cache(maxsize=1024)
+def _wrap_lines(full, wrap_width, prefix_width):
+    """Word-wrap a task line; continuation lines are indented by prefix_width.
+    Works on offsets into full, so the only strings built are the output lines."""
+    wrap_width = max(wrap_width, prefix_width + 1)  # Always make progress on tiny terminals
+    n = len(full)
+    # Very long (pasted) text: find break points by bisecting the space positions
+    # instead of re-scanning each line
+    spaces = [i for i, c in enumerate(full) if c == ' '] if n > 4 * wrap_width else None
+    lines = []
+    cursor = 0
+    indent = ''
+    while cursor < n:
+        room = wrap_width - len(indent)
+        if n - cursor <= room:
+            lines.append(indent + full[cursor:])
+            break
+        # Last space in the allowed window; never break inside the prefix on the first
+        # line, or the loop would stop advancing
+        lo = cursor + prefix_width - len(indent)
+        hi = cursor + room
+        if spaces is None:
+            split = full.rfind(' ', lo, hi)
+        else:
+            j = bisect.bisect_left(spaces, hi) - 1
+            split = spaces[j] if j >= 0 and spaces[j] >= lo else -1
+        if split == -1:
+            split = hi
+        lines.append(indent + full[cursor:split])
+        cursor = split
+        while cursor < n and full[cursor].isspace():
+            cursor += 1
+        indent = ' ' * prefix_width
+    return tuple(lines)
+
+# Screen rows derived from the terminal size; recomputed only on KEY_RESIZE
+Layout = collections.namedtuple('Layout', 'maxy maxx prev_end_y active_title_y active_start_y next_start_y')
+
+def compute_layout(maxy, maxx):
+    # Layout positions - ensure active title is always visible
+    prev_end_y = 6  # Previous week: title at 0, sep at 1, tasks at 2-5 (max 4 tasks)
+    active_title_y = prev_end_y + 1  # Title at line 7
+    active_start_y = active_title_y + 2  # Tasks start at line 9
+    next_start_y = maxy - 12 if maxy > 35 else active_start_y + 12
+    return Layout(maxy, maxx, prev_end_y, active_title_y, active_start_y, next_start_y)
+
+def build_windows(stdscr, layout):
+    """(Re)create one window per screen region so only changed regions get repainted"""
+    maxy, maxx, active_title_y = layout.maxy, layout.maxx, layout.active_title_y
+    next_title_y = layout.next_start_y - 2
+    WINDOWS.clear()
+    # stdscr itself is never drawn on; flush it once so getkey() won't repaint it over the regions
+    stdscr.erase()
+    stdscr.noutrefresh()
+    bounds = {
+        'prev': (0, active_title_y),
+        'active': (active_title_y, next_title_y),
+        'next': (next_title_y, maxy - 1),
+        'help': (maxy - 1, maxy),
+    }
+    for name, (top, bottom) in bounds.items():
+        limit = maxy if name == 'help' else maxy - 1  # Keep the last line for the help bar
+        top = max(0, top)
+        bottom = min(bottom, limit)
+        if bottom > top:
+            WINDOWS[name] = curses.newwin(bottom - top, maxx, top, 0)
+
+# Rows are padded to their full width so each write overwrites the previous frame's
+# contents; no erase()/clrtoeol() needed. Coordinates are window-relative.
+def draw_row(win, y, x, text, width, attr=curses.A_NORMAL):
+    try:
+        win.addnstr(y, x, text.ljust(width), width, attr)
+    except curses.error:
+        pass  # Skip if beyond window
+
+# Titles & separators; their strings only change with the week, its title or the width
+@functools.lru_cache(maxsize=64)
+def _title_label(week_key, text, maxx):
+    label = f"{week_key} – {text}"
+    if len(label) > maxx - 6:
+        label = label[:maxx-9] + "..."
+    return label
+
+@functools.lru_cache(maxsize=8)
+def _separator(char, width):
+    return char * width
+
+def draw_title(win, maxx, y, week_key, text, attr=curses.A_NORMAL):
+    draw_row(win, y, 2, _title_label(week_key, text, maxx), maxx - 6, attr)
+
+def draw_separator(win, maxx, y, char, attr):
+    try:
+        win.addnstr(y, 0, _separator(char, maxx - 2), maxx - 2, attr)
+    except curses.error:
+        pass
+
+# Improved tasks drawing with word-wrap for selected
+def draw_week_tasks(win, maxx, base_y, week_data, is_active, sel_idx=-1, max_tasks=8, scroll_offset=0, max_y=None):
+    win_h = win.getmaxyx()[0]
+    max_y = win_h if max_y is None else min(max_y, win_h)
+    texts, states = week_data['texts'], week_data['states']
+    y = base_y
+    wrap_width = maxx - 16  # margin for prefix + indent
+    row_width = maxx - 4
+    # Local aliases for the per-task loop
+    row, task_row, wrap = draw_row, _task_row, _wrap_lines
+    attrs, sel_attrs = STATE_ATTR[(is_active, False)], STATE_ATTR[(True, True)]
+    if not is_active:
+        sel_idx = -1  # Only the active week shows a selection
+
+    start_idx = scroll_offset if is_active else 0
+    end_idx = len(texts)
+    if max_tasks is not None:
+        end_idx = min(end_idx, start_idx + max_tasks)
+
+    # Walk the visible slice of both columns together; idx tracks the task index
+    idx = start_idx
+    for text, state in zip(texts[start_idx:end_idx], states[start_idx:end_idx]):
+        if y >= max_y:
+            break
+        attr = sel_attrs[state] if idx == sel_idx else attrs[state]
+
+        # Only the selected row is wrapped; every other row comes from the row cache
+        if idx == sel_idx and len(text) + PREFIX_WIDTH > wrap_width:
+            lines = wrap(STATE_SYMBOLS_BY_CODE[state] + text, wrap_width, PREFIX_WIDTH)
+            for line in lines:
+                if y >= max_y: break
+                row(win, y, 2, line, row_width, attr)
+                y += 1
+        else:
+            if y < max_y:
+                row(win, y, 2, task_row(state, text, wrap_width), row_width, attr)
+            y += 1
+
+        idx += 1
+
+    if idx < len(texts) and y < max_y:
+        draw_row(win, y, 2, "... more", row_width, curses.A_DIM)
+        y += 1
+    # Blank out rows left over from a previous, longer list
+    while y < max_y:
+        draw_row(win, y, 2, '', row_width)
+        y += 1
+
+def draw_task_rows(win, maxx, base_y, week_data, sel_idx, scroll_offset, indices):
+    """Repaint individual task rows of the active week in place. Only valid while none
+    of the visible rows is wrapped, so that task idx sits on line base_y + idx - scroll_offset."""
+    win_h = win.getmaxyx()[0]
+    texts, states = week_data['texts'], week_data['states']
+    wrap_width = maxx - 16
+    row_width = maxx - 4
+    attrs, sel_attrs = STATE_ATTR[(True, False)], STATE_ATTR[(True, True)]
+    for idx in indices:
+        y = base_y + idx - scroll_offset
+        if 0 <= idx < len(texts) and base_y <= y < win_h:
+            state = states[idx]
+            attr = sel_attrs[state] if idx == sel_idx else attrs[state]
+            draw_row(win, y, 2, _task_row(state, texts[idx], wrap_width), row_width, attr)
+
+def text_width(text):
+    """Number of terminal columns text takes up; wide (e.g. CJK) characters take two"""
+    if text.isascii():
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(c) in 'WF' else 1 for c in text)
+
+def get_input(win, base_y, base_x, initial='', start_at_beginning=False):
     """Safer line editor with cursor movement + vim-style start support + undo/redo + word navigation"""
     curses.curs_set(1)
-    stdscr.keypad(True)
-    s = list(initial)
-    pos = 0 if start_at_beginning else len(s)
+    win.keypad(True)
+    # Gap buffer: characters before the cursor, and those after it in reverse order,
+    # so typing, deleting and moving the cursor are appends/pops at the list ends
+    pos = 0 if start_at_beginning else len(initial)
+    left, right = list(initial[:pos]), list(reversed(initial[pos:]))
 
-    # Undo/redo history
-    history = [''.join(s)]
+    def text():
+        return ''.join(left) + ''.join(reversed(right))
+
+    # Undo/redo history: one (op, position, char) entry per edit rather than a copy
+    # of the whole line; history_pos is the number of entries currently applied
+    history = []
     history_pos = 0
 
-    _, max_x = stdscr.getmaxyx()
+    _, max_x = win.getmaxyx()
     display_width = max_x - base_x - 2  # margin
 
-    def save_state():
-        nonlocal history, history_pos
-        current = ''.join(s)
+    def record(op, pos, ch):
+        nonlocal history_pos
         # Remove any history after current position
-        history = history[:history_pos + 1]
-        history.append(current)
-        history_pos = len(history) - 1
+        del history[history_pos:]
+        history.append((op, pos, ch))
+        history_pos += 1
         # Limit history to 50 entries
         if len(history) > 50:
             history.pop(0)
             history_pos -= 1
 
+    def seek(pos):
+        """Move the cursor to pos"""
+        while len(left) > pos:
+            right.append(left.pop())
+        while len(left) < pos and right:
+            left.append(right.pop())
+
     def undo():
-        nonlocal s, pos, history_pos
+        nonlocal history_pos
         if history_pos > 0:
             history_pos -= 1
-            s = list(history[history_pos])
-            pos = min(pos, len(s))
+            op, pos, ch = history[history_pos]
+            seek(pos)
+            if op == 'insert':
+                right.pop()
+            else:
+                left.append(ch)
 
     def redo():
-        nonlocal s, pos, history_pos
-        if history_pos < len(history) - 1:
+        nonlocal history_pos
+        if history_pos < len(history):
+            op, pos, ch = history[history_pos]
             history_pos += 1
-            s = list(history[history_pos])
-            pos = min(pos, len(s))
+            seek(pos)
+            if op == 'insert':
+                left.append(ch)
+            else:
+                right.pop()
 
     def skip_word_left():
-        nonlocal pos
         # Skip whitespace
-        while pos > 0 and s[pos - 1].isspace():
-            pos -= 1
+        while left and left[-1].isspace():
+            right.append(left.pop())
         # Skip word
-        while pos > 0 and not s[pos - 1].isspace():
-            pos -= 1
+        while left and not left[-1].isspace():
+            right.append(left.pop())
 
     def skip_word_right():
-        nonlocal pos
         # Skip word
-        while pos < len(s) and not s[pos].isspace():
-            pos += 1
+        while right and not right[-1].isspace():
+            left.append(right.pop())
         # Skip whitespace
-        while pos < len(s) and s[pos].isspace():
-            pos += 1
+        while right and right[-1].isspace():
+            left.append(right.pop())
+
+    def move_left():
+        if left:
+            right.append(left.pop())
+
+    def move_right():
+        if right:
+            left.append(right.pop())
+
+    def move_home():
+        right.extend(reversed(left))
+        left.clear()
+
+    def move_end():
+        left.extend(reversed(right))
+        right.clear()
+
+    def backspace():
+        if left:
+            ch = left.pop()
+            record('delete', len(left), ch)
+
+    def delete_char():
+        if right:
+            record('delete', len(left), right.pop())
+
+    def insert_char(ch):
+        record('insert', len(left), ch)
+        left.append(ch)
 
+    # get_wch() returns ints for special keys and 1-char strings otherwise
+    key_handlers = {
+        curses.KEY_LEFT: move_left,
+        curses.KEY_RIGHT: move_right,
+        curses.KEY_HOME: move_home, '\x01': move_home,  # Ctrl+A - jump to start of line
+        curses.KEY_END: move_end, '\x05': move_end,     # Ctrl+E - jump to end of line
+        curses.KEY_BACKSPACE: backspace, '\x7f': backspace, '\b': backspace,
+        curses.KEY_DC: delete_char,
+    }
+
+    # Escape sequences the terminal didn't turn into a KEY_* code: Esc+<key>, CSI <key>,
+    # CSI <n>~ and CSI 1;<modifier><key>
+    esc_handlers = {
+        'u': undo, 'r': redo,  # Esc+U / Esc+R (vim-style)
+        'b': skip_word_left, 'f': skip_word_right,  # Option+Left/Right on macOS (\x1bb, \x1bf)
+    }
+    csi_handlers = {'D': move_left, 'C': move_right}
+    tilde_handlers = {'1': move_home, '4': move_end, '7': move_home, '8': move_end}
+    modified_handlers = {('9', 'D'): skip_word_left, ('9', 'C'): skip_word_right}  # Option+Left/Right
+
+    def handle_escape():
+        """Read the rest of an escape sequence; returns True for a lone Esc"""
+        next_key = win.get_wch()
+        if next_key != '[':
+            handler = esc_handlers.get(next_key)
+            if handler is None:
+                return True  # Single escape - exit edit mode
+            handler()
+            return False
+        seq = win.get_wch()
+        handler = csi_handlers.get(seq)
+        if handler is None and seq in tilde_handlers:
+            next_char = win.get_wch()
+            if next_char == '~':
+                handler = tilde_handlers[seq]
+            elif next_char == ';' and seq == '1':
+                modifier = win.get_wch()
+                handler = modified_handlers.get((modifier, win.get_wch()))
+        if handler is not None:
+            handler()
+        return False  # Unknown sequences are ignored
+
+    def handle_key(key):
+        """Apply one key to the buffer; returns True when editing is finished"""
+        if key == '\n':
+            return True
+        elif key == '\x1b':  # Escape key or start of escape sequence
+            # The rest of a sequence is already queued, so read it without waiting;
+            # the input loop restores blocking mode afterwards
+            win.nodelay(True)
+            try:
+                return handle_escape()
+            except curses.error:
+                # Timeout or no more keys - treat as single escape
+                return True
+        else:
+            handler = key_handlers.get(key)
+            if handler is not None:
+                handler()
+            elif isinstance(key, str) and key.isprintable():
+                insert_char(key)
+        return False
+
+    shown = None  # Text currently on the editor line; None until the first draw
     while True:
+        full = text()
+        pos = len(left)
         start = max(0, pos - display_width + 5)
-        visible = s[start:start + display_width]
-        visible_str = ''.join(visible)
+        visible_str = full[start:start + display_width]
 
+        # Only rewrite from the first character that changed; a pure cursor move writes nothing.
+        # The write is padded over the previous contents (the row drawn by the main view
+        # at first, then any longer earlier text), so no clrtoeol() is needed.
+        # Positions on screen are columns, which differ from character counts for wide text.
+        if visible_str != shown:
+            if shown is None:
+                first, end_col = 0, display_width
+            else:
+                first = len(os.path.commonprefix((shown, visible_str)))
+                end_col = max(text_width(visible_str), text_width(shown))
+            first_col = text_width(visible_str[:first])
+            tail = visible_str[first:]
+            tail += ' ' * max(0, end_col - first_col - text_width(tail))
+            draw_row(win, base_y, base_x + first_col, tail, len(tail))
+            shown = visible_str
         try:
-            stdscr.move(base_y, base_x)
-            stdscr.clrtoeol()
-            stdscr.addstr(base_y, base_x, visible_str)
-        except curses.error:
-            pass  # Skip if can't draw
-        try:
-            cursor_x = base_x + (pos - start)
-            stdscr.move(base_y, cursor_x)
+            cursor_x = base_x + text_width(full[start:pos])
+            win.move(base_y, cursor_x)
         except curses.error:
             pass
-        stdscr.refresh()
+        win.noutrefresh()
+        curses.doupdate()
 
-        key = stdscr.getkey()
-
-        if key == '\n':
-            break
-        elif key == '\x01':  # Ctrl+A - jump to start of line
-            pos = 0
-        elif key == '\x05':  # Ctrl+E - jump to end of line
-            pos = len(s)
-        elif key == '\x1b':  # Escape key or start of escape sequence
-            # Check for escape sequences
-            stdscr.nodelay(True)
+        # Handle the key that woke us up, then drain anything already queued
+        # (paste, autorepeat) so a burst of input costs a single redraw
+        finished = handle_key(win.get_wch())
+        win.nodelay(True)
+        while not finished:
             try:
-                next_key = stdscr.getkey()
-                if next_key == 'u':  # Esc + U = undo (vim-style)
-                    undo()
-                elif next_key == 'r':  # Esc + R = redo (vim-style)
-                    redo()
-                elif next_key == 'b':  # Option + Left on macOS (\x1bb)
-                    skip_word_left()
-                elif next_key == 'f':  # Option + Right on macOS (\x1bf)
-                    skip_word_right()
-                elif next_key == '[':  # CSI sequences
-                    seq = stdscr.getkey()
-                    if seq == 'D':  # Left arrow
-                        pos = max(0, pos - 1)
-                    elif seq == 'C':  # Right arrow
-                        pos = min(len(s), pos + 1)
-                    elif seq == '1':  # \x1b[1~ (Home) or \x1b[1;9D (Option+Left)
-                        next_char = stdscr.getkey()
-                        if next_char == '~':  # \x1b[1~ - Home
-                            pos = 0
-                        elif next_char == ';':  # \x1b[1;9D - Option+Left
-                            modifier = stdscr.getkey()
-                            direction = stdscr.getkey()
-                            if modifier == '9' and direction == 'D':
-                                skip_word_left()
-                    elif seq == '4':  # \x1b[4~ (End)
-                        next_char = stdscr.getkey()
-                        if next_char == '~':
-                            pos = len(s)
-                    elif seq == '7':  # \x1b[7~ (Home on some terminals)
-                        next_char = stdscr.getkey()
-                        if next_char == '~':
-                            pos = 0
-                    elif seq == '8':  # \x1b[8~ (End on some terminals)
-                        next_char = stdscr.getkey()
-                        if next_char == '~':
-                            pos = len(s)
-                    else:
-                        # Unknown CSI sequence
-                        pass
-                else:
-                    # Single escape - exit edit mode
-                    break
+                key = win.get_wch()
             except curses.error:
-                # Timeout or no more keys - treat as single escape
-                break
-            finally:
-                stdscr.nodelay(False)
-        elif key in ('KEY_LEFT', 'KEY_BACKSPACE', '\x7f', '\b'):
-            save_state()
-            if pos > 0:
-                pos -= 1
-                if key in ('\x7f', '\b'):
-                    del s[pos]
-        elif key == 'KEY_RIGHT':
-            if pos < len(s):
-                pos += 1
-        elif key == 'KEY_HOME':
-            pos = 0
-        elif key == 'KEY_END':
-            pos = len(s)
-        elif key == 'KEY_DC':
-            save_state()
-            if pos < len(s):
-                del s[pos]
-        elif len(key) == 1 and 32 <= ord(key) <= 126:
-            save_state()
-            s.insert(pos, key)
-            pos += 1
+                break  # Input queue is empty
+            finished = handle_key(key)
+        win.nodelay(False)
+        if finished:
+            break
 
     curses.curs_set(0)
-    return ''.join(s)
+    return text()
 
 def show_help():
     print("Weekly Tasks App - task")
@@ -222,6 +608,9 @@ def show_help():
     print("  Ctrl+R     Redo last undone action")
     print("  q         Quit")
     print()
+    print("Options:")
+    print("  --export  Print all tasks as pretty-printed JSON and exit")
+    print()
     print("In edit mode:")
     print("  Esc       Exit edit mode")
     print("  Esc+u     Undo (vim-style)")
@@ -237,10 +626,15 @@ def main(stdscr):
 
     curses.curs_set(0)
     stdscr.keypad(True)
+    stdscr.timeout(int(SAVE_DEBOUNCE * 1000))  # Wake up periodically to flush pending saves
     curses.start_color()
     curses.init_pair(1, curses.COLOR_RED, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_BLUE, curses.COLOR_BLACK)
     curses.init_pair(3, curses.COLOR_GREEN, curses.COLOR_BLACK)
+    bases = [curses.color_pair(COLORS[s]) for s in STATES]
+    STATE_ATTR[(False, False)] = tuple(base | curses.A_DIM for base in bases)  # inactive week
+    STATE_ATTR[(True, False)] = tuple(bases)                                   # active, not selected
+    STATE_ATTR[(True, True)] = tuple(base | curses.A_REVERSE for base in bases)  # active + selected
 
     today = datetime.date.today()
     current_week = get_week_key(today)
@@ -257,18 +651,26 @@ def main(stdscr):
     undo_pos = -1
     MAX_UNDO = 20
 
+    # Snapshots copy each week's columns; the task strings themselves are immutable and shared
+    def snapshot(snap_data):
+        return {k: copy_week(w) for k, w in snap_data.items()}
+
+    def restore(snap):
+        return snapshot(snap)  # Copy again so later edits don't alter the history entry
+
+    # Loaded once; from here on the in-memory data is the source of truth
+    data = load_data()
+
     # Save initial state
-    initial_data = load_data()
-    undo_history.append(json.dumps(initial_data))
+    undo_history.append(snapshot(data))
     undo_pos = 0
 
     def save_undo_state():
         nonlocal undo_history, undo_pos
         # Save current in-memory data, not from disk
-        current_data = data.copy()
         # Remove any history after current position
         undo_history = undo_history[:undo_pos + 1]
-        undo_history.append(json.dumps(current_data))
+        undo_history.append(snapshot(data))
         undo_pos = len(undo_history) - 1
         # Limit history
         if len(undo_history) > MAX_UNDO:
@@ -279,15 +681,14 @@ def main(stdscr):
         nonlocal undo_history, undo_pos, selected, active, prev, nxt, data
         if undo_pos > 0:
             undo_pos -= 1
-            restored_data = json.loads(undo_history[undo_pos])
-            save_data(restored_data)
-            # Reload data immediately
-            data = load_data()
-            active = data[active_week]
-            nxt = data[next_week]
-            prev = data[prev_week]
+            restored_data = restore(undo_history[undo_pos])
+            data = restored_data
+            mark_dirty()
+            active = data.setdefault(active_week, new_week())
+            nxt = data.get(next_week, _EMPTY_WEEK)
+            prev = data.get(prev_week, _EMPTY_WEEK)
             # Adjust selected index
-            selected = max(-1, min(selected, len(active['tasks']) - 1))
+            selected = max(-1, min(selected, len(active['texts']) - 1))
             return True
         return False
 
@@ -295,281 +696,371 @@ def main(stdscr):
         nonlocal undo_history, undo_pos, selected, active, prev, nxt, data
         if undo_pos < len(undo_history) - 1:
             undo_pos += 1
-            restored_data = json.loads(undo_history[undo_pos])
-            save_data(restored_data)
-            # Reload data immediately
-            data = load_data()
-            active = data[active_week]
-            nxt = data[next_week]
-            prev = data[prev_week]
+            restored_data = restore(undo_history[undo_pos])
+            data = restored_data
+            mark_dirty()
+            active = data.setdefault(active_week, new_week())
+            nxt = data.get(next_week, _EMPTY_WEEK)
+            prev = data.get(prev_week, _EMPTY_WEEK)
             # Adjust selected index
-            selected = max(-1, min(selected, len(active['tasks']) - 1))
+            selected = max(-1, min(selected, len(active['texts']) - 1))
             return True
         return False
 
-    while True:
-        data = load_data()
-
-        if active_week not in data:
-            data[active_week] = {'title': 'Editable Title here for the week', 'tasks': []}
-            save_data(data)
-
-        stdscr.clear()
-        maxy, maxx = stdscr.getmaxyx()
-
-        y, w_part = active_week.split('-W')
-        y = int(y)
-        w = int(w_part)
-        active_date = week_to_date(y, w)
-        prev_date = active_date - timedelta(weeks=1)
-        next_date = active_date + timedelta(weeks=1)
-        prev_week = get_week_key(prev_date)
-        next_week = get_week_key(next_date)
-
-        for wk in [prev_week, active_week, next_week]:
-            if wk not in data:
-                data[wk] = {'title': 'Week title', 'tasks': []}
-                save_data(data)
-
-        prev = data[prev_week]
-        active = data[active_week]
-        nxt = data[next_week]
-
-        selected = max(-1, min(selected, len(active['tasks']) - 1))
-
-        # Layout positions - ensure active title is always visible
-        title_y = 0
-        prev_start_y = 2
-        prev_end_y = 6  # Previous week: title at 0, sep at 1, tasks at 2-5 (max 4 tasks)
-        active_title_y = prev_end_y + 1  # Title at line 7
-        active_start_y = active_title_y + 2  # Tasks start at line 9
-        next_start_y = maxy - 12 if maxy > 35 else active_start_y + 12
-
-        # Adjust scroll_offset to make selected visible
-        if selected >= 0:
-            visible_rows = next_start_y - active_start_y - 1
-            if selected < scroll_offset:
-                scroll_offset = selected
-            elif selected > scroll_offset + visible_rows - 1:
-                scroll_offset = selected - (visible_rows - 1)
-            scroll_offset = max(0, scroll_offset)
-
-        # Titles & separators
-        def draw_title(y, week_key, text, attr=curses.A_NORMAL):
-            if y >= maxy: return  # Skip if beyond screen
-            label = f"{week_key} – {text}"
-            if len(label) > maxx - 6:
-                label = label[:maxx-9] + "..."
-            stdscr.addstr(y, 2, label, attr)
-
-        draw_title(title_y, prev_week, prev['title'], curses.A_DIM)
-        if title_y + 1 < maxy:
-            stdscr.addstr(title_y + 1, 0, "─" * (maxx - 2), curses.A_DIM)
-
-        draw_title(active_title_y, active_week, active['title'], curses.A_BOLD)
-        if active_title_y + 1 < maxy:
-            stdscr.addstr(active_title_y + 1, 0, "═" * (maxx - 2), curses.A_BOLD)
-
-        draw_title(next_start_y - 2, next_week, nxt['title'], curses.A_DIM)
-        if next_start_y - 1 < maxy:
-            stdscr.addstr(next_start_y - 1, 0, "─" * (maxx - 2), curses.A_DIM)
-
-        # Improved tasks drawing with word-wrap for selected
-        def draw_week_tasks(base_y, week_data, is_active, sel_idx=-1, max_tasks=8, scroll_offset=0, max_y=None):
-            if max_y is None:
-                max_y = maxy
-            max_y = min(max_y, maxy - 2)  # Leave room for help bar at maxy-1
-            tasks = week_data['tasks']
-            y = base_y
-            wrap_width = maxx - 16  # margin for prefix + indent
-
-            start_idx = scroll_offset if is_active else 0
-            end_idx = len(tasks)
-            if max_tasks is not None:
-                end_idx = min(end_idx, start_idx + max_tasks)
-
-            idx = start_idx
-            while idx < end_idx and y < max_y:
-                t = tasks[idx]
-                prefix = STATE_SYMBOLS[t['state']]           # always 4 chars
-                text = t['text']
-                attr = curses.color_pair(COLORS.get(t['state'], 1))
-                if is_active and idx == sel_idx:
-                    attr |= curses.A_REVERSE
-                if not is_active:
-                    attr |= curses.A_DIM
-
-                full = prefix + text
-                if is_active and idx == sel_idx and len(full) > wrap_width:
-                    lines = []
-                    rem = full
-                    while rem:
-                        if len(rem) <= wrap_width:
-                            lines.append(rem)
-                            break
-                        split = rem.rfind(' ', 0, wrap_width)
-                        if split == -1:
-                            split = wrap_width
-                        lines.append(rem[:split])
-                        rem = rem[split:].lstrip()
-                        if rem:
-                            rem = ' ' * PREFIX_WIDTH + rem
-                    for line in lines:
-                        if y >= max_y: break
-                        try:
-                            stdscr.addstr(y, 2, line, attr)
-                        except curses.error:
-                            pass
-                        y += 1
-                else:
-                    if len(full) > wrap_width + 5:
-                        full = full[:wrap_width - 3] + "..."
-                    if y < max_y:
-                        try:
-                            stdscr.addstr(y, 2, full, attr)
-                        except curses.error:
-                            pass
-                    y += 1
-
-                idx += 1
-
-            if idx < len(tasks) and y < max_y:
-                stdscr.addstr(y, 2, "... more", curses.A_DIM)
-
-        draw_week_tasks(prev_start_y, prev, False, max_tasks=4, max_y=active_title_y - 1)
-        draw_week_tasks(active_start_y, active, True, selected, max_tasks=None, scroll_offset=scroll_offset, max_y=next_start_y - 2)
-        draw_week_tasks(next_start_y, nxt, False, max_tasks=8, max_y=maxy - 1)
-
-        # Help bar
-        mode = " [REORDER]" if reorder_mode else ""
-        hint = " (after selected)" if 0 <= selected < len(active['tasks']) else " (at end)"
-        help_txt = f"↑↓/kj:Move{'/Reorder'+mode} | r:Reorder | ←→:Week | Tab/S-Tab:State | I:Edit@start | a:Add{hint} | ⏎:Edit | d:Del | n/p:Shift | Ctrl+U:Undo | Ctrl+R:Redo | q:Quit"
-        if maxy - 1 < maxy:
-            stdscr.addstr(maxy - 1, 0, help_txt[:maxx - 1], curses.A_DIM)
-
-        stdscr.refresh()
-
-        if edit_mode:
-            if selected == -1:
-                offset = len(f"{active_week} – ")
-                new_title = get_input(stdscr, active_title_y, 2 + offset,
-                                      active['title'], start_at_beginning=force_start)
-                active['title'] = new_title
-            else:
-                t = active['tasks'][selected]
-                offset = PREFIX_WIDTH                               # ← Fixed!
-                edit_y = active_start_y + (selected - scroll_offset)
-                new_text = get_input(stdscr, edit_y, 2 + offset,
-                                     t['text'], start_at_beginning=force_start)
-                t['text'] = new_text
-            save_data(data)
-            edit_mode = False
-            force_start = False
-            continue
+    def mark_rows(*indices):
+        """Mark single task rows of the active week for repaint, or the whole region if one
+        of them is wrapped (the selected row can span several lines, shifting the rest)"""
+        texts = active['texts']
+        wrap_width = layout.maxx - 16
+        for idx in indices:
+            if 0 <= idx < len(texts):
+                if len(texts[idx]) + PREFIX_WIDTH > wrap_width:
+                    dirty.add('active')
+                    return
+                dirty_rows.add(idx)
 
-        key = stdscr.getkey()
-        force_start = False
+    # Key handlers; each one updates the UI state and marks the regions it changed as dirty
+    def quit_app():
+        nonlocal running
+        flush_data(data, force=True)
+        sync_data()
+        running = False
 
-        # Handle control key sequences
-        if key == '\x15':  # Ctrl+U = undo
-            if undo():
-                continue
-        elif key == '\x12':  # Ctrl+R = redo
-            if redo():
-                continue
+    def toggle_reorder():
+        nonlocal reorder_mode
+        reorder_mode = not reorder_mode
 
-        # Normal mode commands
-        if key.lower() == 'q':
-            save_data(data)
-            break
-        elif key.lower() == 'r':
-            reorder_mode = not reorder_mode
-        elif key == '\t' and 0 <= selected < len(active['tasks']):
-            active['tasks'][selected]['state'] = STATE_CYCLE_FORWARD[active['tasks'][selected]['state']]
-            save_data(data)
-            save_undo_state()
-        elif key == '\x1b[Z' and 0 <= selected < len(active['tasks']):
-            active['tasks'][selected]['state'] = STATE_CYCLE_BACKWARD[active['tasks'][selected]['state']]
-            save_data(data)
-            save_undo_state()
-        elif key == 'I':  # Shift+I - edit at start
-            if selected == -1 or 0 <= selected < len(active['tasks']):
-                edit_mode = True
-                force_start = True
-        elif key in ('KEY_UP', 'k'):
-            tasks = active['tasks']
-            if reorder_mode:
-                if selected > 0:
-                    tasks[selected-1], tasks[selected] = tasks[selected], tasks[selected-1]
-                    selected -= 1
-                    save_data(data)
-                    save_undo_state()
-            else:
-                if selected > 0:
-                    selected -= 1
-                elif selected == -1 and tasks:
-                    selected = len(tasks) - 1
-        elif key in ('KEY_DOWN', 'j'):
-            tasks = active['tasks']
-            if reorder_mode:
-                if selected < len(tasks) - 1:
-                    tasks[selected+1], tasks[selected] = tasks[selected], tasks[selected+1]
-                    selected += 1
-                    save_data(data)
-                    save_undo_state()
-            else:
-                if selected == -1 and tasks:
-                    selected = 0
-                elif selected < len(tasks) - 1:
-                    selected += 1
-                elif selected == len(tasks) - 1:
-                    selected = -1
-        elif key in ('KEY_LEFT', 'h'):
-            active_week = prev_week
-            selected = -1
-            scroll_offset = 0
-        elif key in ('KEY_RIGHT', 'l'):
-            active_week = next_week
-            selected = -1
-            scroll_offset = 0
-        elif key.lower() == 'a':
-            tasks = active['tasks']
-            new_task = {'text': 'New task', 'state': 'TO-DO'}
-            if selected == -1 or selected >= len(tasks):
-                tasks.append(new_task)
-                selected = len(tasks) - 1
-            else:
-                pos = selected + 1
-                tasks.insert(pos, new_task)
-                selected = pos
-            save_data(data)
+    def cycle_state(step):
+        if 0 <= selected < len(active['texts']):
+            states = active['states']
+            states[selected] = (states[selected] + step) % len(STATES)
+            mark_dirty()
             save_undo_state()
+            mark_rows(selected)
+
+    def cycle_forward():
+        cycle_state(1)
+
+    def cycle_backward():
+        cycle_state(-1)
+
+    def start_edit(at_beginning=False):
+        nonlocal edit_mode, force_start
+        if selected == -1 or 0 <= selected < len(active['texts']):
             edit_mode = True
-            force_start = False
-        elif key == '\n' and selected is not None:
-            edit_mode = True
-            force_start = False
-        elif key.lower() == 'd' and 0 <= selected < len(active['tasks']):
-            del active['tasks'][selected]
+            force_start = at_beginning
+
+    def edit_at_start():  # Shift+I - edit at start
+        start_edit(at_beginning=True)
+
+    def swap_tasks(i, j):
+        for column in (active['texts'], active['states']):
+            column[i], column[j] = column[j], column[i]
+
+    def move_up():
+        nonlocal selected
+        tasks = active['texts']
+        before = selected
+        if reorder_mode:
+            if selected > 0:
+                swap_tasks(selected - 1, selected)
+                selected -= 1
+                mark_dirty()
+                save_undo_state()
+        else:
+            if selected > 0:
+                selected -= 1
+            elif selected == -1 and tasks:
+                selected = len(tasks) - 1
+        if selected != before:
+            mark_rows(before, selected)  # A swap or a selection move only changes these two rows
+
+    def move_down():
+        nonlocal selected
+        tasks = active['texts']
+        before = selected
+        if reorder_mode:
+            if 0 <= selected < len(tasks) - 1:
+                swap_tasks(selected + 1, selected)
+                selected += 1
+                mark_dirty()
+                save_undo_state()
+        else:
+            if selected == -1 and tasks:
+                selected = 0
+            elif selected < len(tasks) - 1:
+                selected += 1
+            elif selected == len(tasks) - 1:
+                selected = -1
+        if selected != before:
+            mark_rows(before, selected)
+
+    def go_to_week(week_key):
+        nonlocal active_week, selected, scroll_offset
+        flush_data(data, force=True)  # Leaving a week is a natural point to persist its edits
+        active_week = week_key
+        selected = -1
+        scroll_offset = 0
+        dirty.update(REGIONS)
+
+    def prev_week_view():
+        go_to_week(prev_week)
+
+    def next_week_view():
+        go_to_week(next_week)
+
+    def add_task():
+        nonlocal selected
+        texts, states = active['texts'], active['states']
+        if selected == -1 or selected >= len(texts):
+            pos = len(texts)
+        else:
+            pos = selected + 1
+        texts.insert(pos, 'New task')
+        states.insert(pos, STATE_CODES['TO-DO'])
+        selected = pos
+        mark_dirty()
+        save_undo_state()
+        start_edit()
+        dirty.add('active')
+
+    def delete_task():
+        nonlocal selected
+        if 0 <= selected < len(active['texts']):
+            del active['texts'][selected]
+            del active['states'][selected]
             selected = max(-1, selected - 1)
-            save_data(data)
+            mark_dirty()
             save_undo_state()
-        elif key.lower() in ('n', 'p') and 0 <= selected < len(active['tasks']):
-            tasks = active['tasks']
-            task = tasks.pop(selected)
-            delta = 1 if key.lower() == 'n' else -1
-            target_date = active_date + timedelta(weeks=delta)
-            target_week = get_week_key(target_date)
-            if target_week not in data:
-                data[target_week] = {'title': 'Week title', 'tasks': []}
-            data[target_week]['tasks'].append(task)
-            selected = max(-1, min(selected, len(tasks) - 1))
-            save_data(data)
+            dirty.add('active')
+
+    def shift_task(delta):
+        nonlocal selected
+        if 0 <= selected < len(active['texts']):
+            target_week = next_week if delta > 0 else prev_week
+            target = data.setdefault(target_week, new_week())
+            target['texts'].append(active['texts'].pop(selected))
+            target['states'].append(active['states'].pop(selected))
+            selected = max(-1, min(selected, len(active['texts']) - 1))
+            mark_dirty()
             save_undo_state()
+            dirty.update(REGIONS)
 
-if __name__ == '__main__':
-    curses.wrapper(main)
+    def shift_next():
+        shift_task(1)
+
+    def shift_prev():
+        shift_task(-1)
+
+    def undo_action():
+        if undo():
+            dirty.update(REGIONS)
+
+    def redo_action():
+        if redo():
+            dirty.update(REGIONS)
+
+    def resize():
+        flush_data(data, force=True)
+        apply_size()
+
+    # get_wch() returns ints for special keys and 1-char strings otherwise
+    key_handlers = {
+        '\x15': undo_action,  # Ctrl+U
+        '\x12': redo_action,  # Ctrl+R
+        curses.KEY_RESIZE: resize,
+        'q': quit_app, 'Q': quit_app,
+        'r': toggle_reorder, 'R': toggle_reorder,
+        '\t': cycle_forward,
+        curses.KEY_BTAB: cycle_backward,  # Shift+Tab
+        'I': edit_at_start,
+        curses.KEY_UP: move_up, 'k': move_up,
+        curses.KEY_DOWN: move_down, 'j': move_down,
+        curses.KEY_LEFT: prev_week_view, 'h': prev_week_view,
+        curses.KEY_RIGHT: next_week_view, 'l': next_week_view,
+        'a': add_task, 'A': add_task,
+        '\n': start_edit,
+        'd': delete_task, 'D': delete_task,
+        'n': shift_next, 'N': shift_next,
+        'p': shift_prev, 'P': shift_prev,
+    }
+
+    def draw_prev(win):
+        maxx = layout.maxx
+        draw_title(win, maxx, 0, prev_week, prev['title'], curses.A_DIM)
+        draw_separator(win, maxx, 1, "─", curses.A_DIM)
+        draw_week_tasks(win, maxx, 2, prev, False, max_tasks=4, max_y=layout.prev_end_y)
+
+    def draw_active(win):
+        maxx = layout.maxx
+        draw_title(win, maxx, 0, active_week, active['title'], curses.A_BOLD)
+        draw_separator(win, maxx, 1, "═", curses.A_BOLD)
+        draw_week_tasks(win, maxx, 2, active, True, selected, max_tasks=None, scroll_offset=scroll_offset)
+
+    def draw_next(win):
+        maxx = layout.maxx
+        draw_title(win, maxx, 0, next_week, nxt['title'], curses.A_DIM)
+        draw_separator(win, maxx, 1, "─", curses.A_DIM)
+        draw_week_tasks(win, maxx, 2, nxt, False, max_tasks=8)
+
+    def draw_help(win):
+        draw_row(win, 0, 0, help_shown, layout.maxx - 1, curses.A_DIM)
+
+    painters = {'prev': draw_prev, 'active': draw_active, 'next': draw_next, 'help': draw_help}
+
+    def render():
+        """Repaint only the dirty regions, then push them to the terminal in one go"""
+        for name in REGIONS:
+            win = WINDOWS.get(name)
+            if win is None:
+                continue
+            if name in dirty:
+                painters[name](win)
+                win.noutrefresh()
+            elif name == 'active' and dirty_rows:
+                draw_task_rows(win, layout.maxx, 2, active, selected, scroll_offset, dirty_rows)
+                win.noutrefresh()
+        dirty.clear()
+        dirty_rows.clear()
+        curses.doupdate()
+
+    def apply_size():
+        """Re-read the terminal size and rebuild everything that depends on it"""
+        nonlocal layout
+        curses.update_lines_cols()
+        layout = compute_layout(*stdscr.getmaxyx())
+        build_windows(stdscr, layout)
+        _wrap_lines.cache_clear()  # Wrapped and truncated rows were for the old width
+        _task_row.cache_clear()
+        dirty.update(REGIONS)
+
+    # Regions needing a repaint this frame; everything is dirty on the first pass
+    dirty = set(REGIONS)
+    # Active week task indices to repaint on their own when the whole region isn't dirty
+    dirty_rows = set()
+    shown_scroll = 0  # Scroll offset the active region was last drawn with
+    # The size only changes on KEY_RESIZE, so it's read once here and in resize()
+    layout = None
+    apply_size()
+    running = True
+    pending = None  # A key already read from a burst, handled before the next repaint
+    neighbors_for = None  # Week that prev_week/next_week were computed for
+    help_shown = None  # Help bar text last drawn
+    last_render = 0.0
+
+    # Edits are saved with a delay, so make sure a crash or Ctrl+C still writes them
+    try:
+        while running:
+            if neighbors_for != active_week:
+                prev_week, next_week = week_neighbors(active_week)
+                neighbors_for = active_week
+
+            # Neighbouring weeks are only displayed, so don't add them to the data.
+            # The active week is created in memory, and only gets saved once edited.
+            prev = data.get(prev_week, _EMPTY_WEEK)
+            nxt = data.get(next_week, _EMPTY_WEEK)
+            active = data.get(active_week)
+            if active is None:
+                active = data[active_week] = new_week()
+
+            selected = max(-1, min(selected, len(active['texts']) - 1))
+
+            # The help bar is only repainted when its text differs from what's on screen
+            help_txt = HELP_VARIANTS[(reorder_mode, 0 <= selected < len(active['texts']))]
+            if help_txt is not help_shown:
+                help_shown = help_txt
+                dirty.add('help')
+
+            # Adjust scroll_offset to make selected visible
+            active_win = WINDOWS.get('active')
+            if selected >= 0 and active_win is not None:
+                # Task rows the active window really has (title and separator take two),
+                # which is less than the layout asks for when the window got clipped
+                visible_rows = max(1, active_win.getmaxyx()[0] - 2)
+                if selected < scroll_offset:
+                    scroll_offset = selected
+                elif selected > scroll_offset + visible_rows - 1:
+                    scroll_offset = selected - (visible_rows - 1)
+                scroll_offset = max(0, scroll_offset)
+
+            # Single-row repaints assume each task keeps its line, so scrolling repaints the region
+            if scroll_offset != shown_scroll:
+                shown_scroll = scroll_offset
+                dirty.add('active')
+
+            # Nothing visible changed (idle timeout or a no-op key): skip drawing entirely.
+            # While keys are queued, only repaint once a frame so a burst costs one redraw.
+            if (dirty or dirty_rows) and (pending is None or time.monotonic() - last_render >= FRAME_INTERVAL):
+                render()
+                last_render = time.monotonic()
+
+            if edit_mode:
+                # The editor blocks the loop until it's done, so don't hold earlier changes back
+                flush_data(data, force=True)
+                win = WINDOWS.get('active')
+                if win is not None:
+                    if selected == -1:
+                        offset = len(f"{active_week} – ")
+                        new_title = get_input(win, 0, 2 + offset,
+                                              active['title'], start_at_beginning=force_start)
+                        active['title'] = new_title
+                    else:
+                        offset = PREFIX_WIDTH                               # ← Fixed!
+                        edit_y = layout.active_start_y - layout.active_title_y + (selected - scroll_offset)
+                        new_text = get_input(win, edit_y, 2 + offset,
+                                             active['texts'][selected], start_at_beginning=force_start)
+                        active['texts'][selected] = new_text
+                    mark_dirty()
+                edit_mode = False
+                force_start = False
+                dirty.add('active')
+                # The editor consumes KEY_RESIZE itself, so catch up on a resize made while editing
+                if stdscr.getmaxyx() != (layout.maxy, layout.maxx):
+                    apply_size()
+                continue
+
+            if pending is None:
+                flush_data(data)
+                try:
+                    key = stdscr.get_wch()
+                except curses.error:
+                    # Idle: pick up changes another process made to the file, unless ours are unsaved
+                    if not _dirty:
+                        try:
+                            fresh = load_data()
+                        except (ValueError, KeyError, TypeError, OSError):
+                            # Caught mid-write or malformed: keep what we have; _CACHE is
+                            # untouched, so the next idle tick tries again
+                            continue
+                        if fresh is not data:
+                            data = fresh
+                            dirty.update(REGIONS)
+                    continue
+            else:
+                key, pending = pending, None
+            force_start = False
+
+            handler = key_handlers.get(key)
+            if handler is not None:
+                handler()
+
+            # Pick up the next queued key without waiting; the editor drains its own input
+            if running and not edit_mode:
+                stdscr.nodelay(True)
+                try:
+                    pending = stdscr.get_wch()
+                except curses.error:
+                    pass
+                stdscr.timeout(int(SAVE_DEBOUNCE * 1000))
+    finally:
+        flush_data(data, force=True)
 
 def entry_point():
     """Entry point for console script"""
+    if len(sys.argv) > 1 and sys.argv[1] == '--export':
+        export_data()
+        return
     curses.wrapper(main)
+
+if __name__ == '__main__':
+    entry_point()
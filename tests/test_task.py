@@ -0,0 +1,91 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task
+
+wrap = task._wrap_lines.__wrapped__
+
+
+class WrapLinesTest(unittest.TestCase):
+    def test_short_text_is_one_line(self):
+        self.assertEqual(wrap('[ ] short', 20, 4), ('[ ] short',))
+
+    def test_wraps_at_spaces_with_indent(self):
+        self.assertEqual(wrap('[ ] buy milk and eggs today', 12, 4),
+                         ('[ ] buy', '    milk', '    and', '    eggs', '    today'))
+
+    def test_long_text_uses_bisect_path(self):
+        full = '[ ] one two three four five six seven eight nine ten'
+        self.assertGreater(len(full), 4 * 10)
+        self.assertEqual(wrap(full, 10, 4),
+                         ('[ ] one', '    two', '    three', '    four', '    five',
+                          '    six', '    seven', '    eight', '    nine', '    ten'))
+
+    def test_unbroken_word_is_hard_split(self):
+        self.assertEqual(wrap('[ ] ' + 'x' * 25, 10, 4),
+                         ('[ ] xxxxxx', '    xxxxxx', '    xxxxxx', '    xxxxxx', '    x'))
+
+    def test_tiny_width_still_terminates(self):
+        self.assertEqual(wrap('[ ] ab cd', 2, 4), ('[ ] a', '    b', '    c', '    d'))
+        self.assertEqual(wrap('[ ] ab', 0, 4), ('[ ] a', '    b'))
+
+
+class WeekJsonTest(unittest.TestCase):
+    def test_round_trip(self):
+        stored = {'title': 'Plans', 'tasks': [
+            {'text': 'first', 'state': 'TO-DO'},
+            {'text': 'second', 'state': 'PENDING'},
+            {'text': 'third', 'state': 'COMPLETED'},
+        ]}
+        week = task.week_from_json(stored)
+        self.assertEqual(week['texts'], ['first', 'second', 'third'])
+        self.assertIsInstance(week['states'], bytearray)
+        self.assertEqual(list(week['states']), [0, 1, 2])
+        self.assertEqual(task.week_to_json(week), stored)
+
+
+class SaveDataTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        data_dir = os.path.join(self.dir, 'data')
+        os.mkdir(data_dir)
+        self.data_file = os.path.join(data_dir, 'weekly_tasks.json')
+        for name, value in (('DATA_DIR', data_dir), ('DATA_FILE', self.data_file),
+                            ('_CACHE', {'mtime_ns': 0, 'data': None})):
+            patcher = mock.patch.object(task, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.data = {'2024-W01': task.week_from_json(
+            {'title': 'Plans', 'tasks': [{'text': 'first', 'state': 'PENDING'}]})}
+
+    def test_keeps_file_mode(self):
+        with open(self.data_file, 'w') as f:
+            f.write('{}')
+        os.chmod(self.data_file, 0o600)
+        task.save_data(self.data)
+        self.assertEqual(stat.S_IMODE(os.stat(self.data_file).st_mode), 0o600)
+        task._CACHE['data'] = None
+        self.assertEqual(task.load_data(), self.data)
+
+    def test_writes_through_symlink(self):
+        real = os.path.join(self.dir, 'real.json')
+        with open(real, 'w') as f:
+            f.write('{}')
+        os.symlink(real, self.data_file)
+        task.save_data(self.data)
+        self.assertTrue(os.path.islink(self.data_file))
+        self.assertEqual(os.path.realpath(self.data_file), os.path.realpath(real))
+        task._CACHE['data'] = None
+        self.assertEqual(task.load_data(), self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()